@@ -130,14 +130,23 @@ with tab3:
 # ===============================================================
 
 example_validation = """
-def validar_cronograma_excel(path: str) -> tuple[bool, str]:
+def validar_cronograma_excel(path) -> dict:
     \"\"\"
     Validar estructura del Excel antes de importar.
     
+    Abre el libro en modo solo lectura y lee únicamente los nombres de
+    hojas y la fila de encabezados, sin cargar las filas de datos.
+    
     Returns:
-        (es_válido, mensaje)
+        {
+            "es_valido": bool,
+            "mensaje": str,
+            "faltantes": List[str],
+            "extra": List[str],
+            "total_filas": int
+        }
     \"\"\"
-    import pandas as pd
+    from openpyxl import load_workbook
     
     REQUIRED_COLUMNS = {
         "Programa", "Año", "Módulo", "Materia", "Horas",
@@ -146,26 +155,54 @@ def validar_cronograma_excel(path: str) -> tuple[bool, str]:
         "TipoMateria", "SolapaFuente", "MateriaID", "MateriaKey"
     }
     
+    resultado = {
+        "es_valido": False,
+        "mensaje": "",
+        "faltantes": [],
+        "extra": [],
+        "total_filas": 0
+    }
+    
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+    except Exception as e:
+        resultado["mensaje"] = f"Error: {str(e)}"
+        return resultado
+    
     try:
-        # Leer primeras filas
-        df = pd.read_excel(path, sheet_name="CronogramaConsolidado", nrows=1)
+        if "CronogramaConsolidado" not in wb.sheetnames:
+            resultado["mensaje"] = "Hoja 'CronogramaConsolidado' no encontrada"
+            return resultado
         
-        # Validar columnas
-        missing = REQUIRED_COLUMNS - set(df.columns)
-        if missing:
-            return False, f"Columnas faltantes: {', '.join(sorted(missing))}"
+        ws = wb["CronogramaConsolidado"]
         
-        return True, "Excel válido"
-    
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+        # Solo la fila de encabezados
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        columnas = {str(c).strip() for c in header if c is not None}
+        
+        resultado["faltantes"] = sorted(REQUIRED_COLUMNS - columnas)
+        resultado["extra"] = sorted(columnas - REQUIRED_COLUMNS)
+        # max_row sale de la dimensión declarada en la hoja (sin recorrer filas)
+        resultado["total_filas"] = max((ws.max_row or 1) - 1, 0)
+        
+        if resultado["faltantes"]:
+            resultado["mensaje"] = f"Columnas faltantes: {', '.join(resultado['faltantes'])}"
+        else:
+            resultado["es_valido"] = True
+            resultado["mensaje"] = "Excel válido"
+        
+        return resultado
+    finally:
+        wb.close()
 
-# Uso en Streamlit
-is_valid, msg = validar_cronograma_excel(temp_path)
-if not is_valid:
-    st.error(msg)
+# Uso en Streamlit (antes de lanzar la importación)
+validacion = validar_cronograma_excel(temp_path)
+if not validacion["es_valido"]:
+    st.error(validacion["mensaje"])
 else:
-    st.success(msg)
+    st.success(f"{validacion['mensaje']} ({validacion['total_filas']} filas)")
+    if validacion["extra"]:
+        st.info(f"Columnas no utilizadas: {', '.join(validacion['extra'])}")
 """
 
 # ===============================================================
@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import date, datetime
 import pandas as pd
+from sqlalchemy import insert
 from lib.db import get_session
 from lib.models import Estudiante, Course, CourseSource, StudentPlanItem, PlanVersion
 from lib.metrics import check_electives_count, compute_orientation_counts, get_student_risk_report
@@ -20,6 +21,118 @@ def _append_changelog(text: str):
         logger.error(f"No se pudo escribir ChangeLog: {e}")
 
 
+def importar_planes(df: pd.DataFrame, session) -> dict:
+    """
+    Importar planes de una cohorte desde una planilla.
+    
+    Columnas: Documento, MateriaID (obligatorias) y Año, Prioridad,
+    EsBackup (opcionales); sin Año se usa el del curso. Usa la versión
+    vigente de cada estudiante o crea una nueva; estudiantes, cursos,
+    versiones e items existentes se cargan una sola vez y los items se
+    insertan en un único lote.
+    
+    Returns:
+        {
+            "items_creados": int,
+            "versiones_creadas": int,
+            "ya_en_plan": int,
+            "errores": List[str]
+        }
+    """
+    def columna(nombre):
+        if nombre not in df.columns:
+            return pd.Series(None, index=df.index, dtype="string")
+        serie = df[nombre].astype("string").str.strip()
+        return serie.mask(serie == "")
+    
+    documento = columna("Documento")
+    materia_id = columna("MateriaID")
+    ano_txt = columna("Año")
+    ano = pd.to_numeric(ano_txt, errors="coerce")
+    prioridad_txt = columna("Prioridad")
+    prioridad = pd.to_numeric(prioridad_txt, errors="coerce")
+    es_backup = columna("EsBackup").str.lower().isin(["1", "true", "si", "sí", "x"])
+    
+    estudiantes = dict(session.query(Estudiante.documento, Estudiante.id).all())
+    cursos = {
+        mid: (cid, c_ano, c_estado)
+        for mid, cid, c_ano, c_estado in session.query(Course.materia_id, Course.id, Course.ano, Course.estado)
+    }
+    # Versión vigente más reciente por estudiante
+    versiones = dict(session.query(PlanVersion.estudiante_id, PlanVersion.id).filter(
+        PlanVersion.vigente_hasta == None
+    ).order_by(PlanVersion.creado_en).all())
+    en_plan = set(session.query(StudentPlanItem.plan_version_id, StudentPlanItem.course_id).filter(
+        StudentPlanItem.plan_version_id.in_(session.query(PlanVersion.id).filter(PlanVersion.vigente_hasta == None))
+    ).all())
+    
+    est_ids = documento.map(estudiantes)
+    course_ids = materia_id.map({mid: cid for mid, (cid, _, _) in cursos.items()})
+    course_activo = materia_id.map({mid: c_estado == 'activo' for mid, (_, _, c_estado) in cursos.items()})
+    
+    errores_fila = {
+        "Documento o MateriaID vacío": documento.isna() | materia_id.isna(),
+        "Documento no encontrado": documento.notna() & est_ids.isna(),
+        "MateriaID no encontrada": materia_id.notna() & course_ids.isna(),
+        "MateriaID inactiva": course_ids.notna() & ~course_activo.fillna(False).astype(bool),
+        "Año inválido": ano_txt.notna() & ano.isna(),
+        "Prioridad inválida": prioridad_txt.notna() & (prioridad.isna() | (prioridad % 1 != 0)),
+    }
+    invalida = pd.Series(False, index=df.index)
+    fallidas = []
+    for mensaje, mascara in errores_fila.items():
+        fallidas.extend((idx, mensaje) for idx in df.index[mascara & ~invalida])
+        invalida |= mascara
+    errores = [f"Fila {idx+2}: {mensaje}" for idx, mensaje in sorted(fallidas)]
+    
+    validas = df.index[~invalida]
+    
+    # Crear versiones para quienes no tienen una vigente
+    today = date.today()
+    sin_version = sorted({int(est_ids[idx]) for idx in validas} - versiones.keys())
+    if sin_version:
+        creadas = session.execute(insert(PlanVersion).returning(PlanVersion.estudiante_id, PlanVersion.id), [
+            {
+                "estudiante_id": est_id,
+                "nombre": f"Versión {today.isoformat()}",
+                "vigente_desde": today,
+                "estado": "abierta",
+            }
+            for est_id in sin_version
+        ])
+        versiones.update(creadas.tuples().all())
+    
+    items = []
+    ya_en_plan = 0
+    for idx in validas:
+        est_id = int(est_ids[idx])
+        clave = (versiones[est_id], int(course_ids[idx]))
+        _, ano_curso, _ = cursos[materia_id[idx]]
+        if clave in en_plan:
+            ya_en_plan += 1
+            continue
+        en_plan.add(clave)
+        items.append({
+            "estudiante_id": est_id,
+            "course_id": clave[1],
+            "ano": int(ano[idx]) if pd.notna(ano[idx]) else (ano_curso or today.year),
+            "estado": "PLANNED",
+            "prioridad": int(prioridad[idx]) if pd.notna(prioridad[idx]) else 0,
+            "es_backup": bool(es_backup[idx]),
+            "plan_version_id": clave[0],
+        })
+    
+    if items:
+        session.execute(insert(StudentPlanItem), items)
+    
+    return {
+        "items_creados": len(items),
+        "versiones_creadas": len(sin_version),
+        "ya_en_plan": ya_en_plan,
+        "errores": errores,
+    }
+
+
 def run():
     st.title("📚 Gestión de Planes y Versiones (Rutas)")
 
@@ -30,6 +143,39 @@ def run():
         st.info("No hay estudiantes registrados.")
         return
 
+    with st.expander("📥 Importar planes de la cohorte"):
+        st.caption("Planilla con columnas Documento y MateriaID (obligatorias) y Año, Prioridad, EsBackup.")
+        archivo_planes = st.file_uploader("Selecciona planilla", type=["xlsx", "xls", "csv"], key="planes_upload")
+        if archivo_planes and st.button("🚀 Importar planes", key="import_planes"):
+            try:
+                if archivo_planes.name.endswith('.csv'):
+                    df_planes = pd.read_csv(archivo_planes, dtype=str)
+                else:
+                    df_planes = pd.read_excel(archivo_planes, dtype=str)
+
+                faltantes = {"Documento", "MateriaID"} - set(df_planes.columns)
+                if faltantes:
+                    st.error(f"Columnas faltantes: {', '.join(sorted(faltantes))}")
+                else:
+                    with get_session() as session:
+                        resultado = importar_planes(df_planes, session)
+                        session.commit()
+                    _append_changelog(
+                        f"Importación de planes: {resultado['items_creados']} items, "
+                        f"{resultado['versiones_creadas']} versiones nuevas"
+                    )
+                    st.success(
+                        f"{resultado['items_creados']} materias agregadas, {resultado['versiones_creadas']} versiones creadas, "
+                        f"{resultado['ya_en_plan']} ya estaban en el plan"
+                    )
+                    if resultado["errores"]:
+                        st.warning(f"{len(resultado['errores'])} filas con errores")
+                        for error in resultado["errores"][:20]:
+                            st.write(f"- {error}")
+            except Exception as e:
+                logger.error(f"Error importando planes: {e}")
+                st.error(f"Error: {str(e)}")
+
     est_map = {f"{e.nombre} ({e.documento})": e.id for e in estudiantes}
     sel = st.selectbox("Seleccionar Estudiante", list(est_map.keys()))
     estudiante_id = est_map.get(sel)
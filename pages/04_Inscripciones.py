@@ -167,6 +167,7 @@ def run():
 import streamlit as st
 from datetime import date, datetime
 import pandas as pd
+from sqlalchemy import insert, update
 from lib.db import get_session
 from lib.models import (
     Estudiante, Course, StudentPlanItem, PlanVersion, Enrollment
@@ -176,6 +177,8 @@ from lib.utils import get_logger
 
 logger = get_logger(__name__)
 
+ENROLLMENT_STATUSES = ["planned", "in_progress", "completed", "dropped"]
+
 
 def _append_changelog(text: str):
     ts = datetime.utcnow().isoformat()
@@ -285,6 +288,102 @@ def check_alerts(estudiante_id: int, session):
     return alerts
 
 
+def importar_notas(df: pd.DataFrame, session) -> dict:
+    """
+    Importar notas de una planilla (una fila por estudiante y materia).
+    
+    Columnas: Documento, MateriaID (obligatorias) y Status, Nota,
+    NotaNumerica, Semestre, Año (opcionales). Los estudiantes, cursos y
+    enrollments existentes se cargan una sola vez en diccionarios; los
+    enrollments se crean o actualizan por (estudiante, curso) en lotes.
+    
+    Returns:
+        {
+            "creados": int,
+            "actualizados": int,
+            "errores": List[str],
+            "documentos_no_encontrados": List[str],
+            "materias_no_encontradas": List[str]
+        }
+    """
+    def columna(nombre):
+        if nombre not in df.columns:
+            return pd.Series(None, index=df.index, dtype="string")
+        serie = df[nombre].astype("string").str.strip()
+        return serie.mask(serie == "")
+    
+    documento = columna("Documento")
+    materia_id = columna("MateriaID")
+    status = columna("Status").str.lower()
+    nota = columna("Nota")
+    nota_num_txt = columna("NotaNumerica")
+    nota_num = pd.to_numeric(nota_num_txt, errors="coerce")
+    semestre_txt = columna("Semestre")
+    semestre = pd.to_numeric(semestre_txt, errors="coerce")
+    ano_txt = columna("Año")
+    ano = pd.to_numeric(ano_txt, errors="coerce")
+    
+    estudiantes = dict(session.query(Estudiante.documento, Estudiante.id).all())
+    cursos = dict(session.query(Course.materia_id, Course.id).all())
+    enrollments = {}
+    for en_id, est_id, course_id in session.query(Enrollment.id, Enrollment.estudiante_id, Enrollment.course_id):
+        enrollments.setdefault((est_id, course_id), en_id)
+    
+    est_ids = documento.map(estudiantes)
+    course_ids = materia_id.map(cursos)
+    
+    # Validaciones sobre columnas completas
+    errores_fila = {
+        "Documento o MateriaID vacío": documento.isna() | materia_id.isna(),
+        "Documento no encontrado": documento.notna() & est_ids.isna(),
+        "MateriaID no encontrada": materia_id.notna() & course_ids.isna(),
+        "Status inválido": status.notna() & ~status.isin(ENROLLMENT_STATUSES),
+        "NotaNumerica inválida": nota_num_txt.notna() & (nota_num.isna() | (nota_num < 0) | (nota_num > 5)),
+        "Semestre inválido": semestre_txt.notna() & (semestre.isna() | (semestre < 1) | (semestre > 8)),
+        "Año inválido": ano_txt.notna() & (ano.isna() | (ano < 2020) | (ano > 2030)),
+    }
+    invalida = pd.Series(False, index=df.index)
+    fallidas = []
+    for mensaje, mascara in errores_fila.items():
+        fallidas.extend((idx, mensaje) for idx in df.index[mascara & ~invalida])
+        invalida |= mascara
+    errores = [f"Fila {idx+2}: {mensaje}" for idx, mensaje in sorted(fallidas)]
+    
+    ahora = datetime.utcnow()
+    # Si una clave se repite en la planilla, gana la última fila
+    nuevos = {}
+    cambios = {}
+    for idx in df.index[~invalida]:
+        clave = (int(est_ids[idx]), int(course_ids[idx]))
+        valores = {
+            "status": status[idx] if pd.notna(status[idx]) else None,
+            "nota": nota[idx] if pd.notna(nota[idx]) else None,
+            "nota_numerica": float(nota_num[idx]) if pd.notna(nota_num[idx]) else None,
+            "semestre": int(semestre[idx]) if pd.notna(semestre[idx]) else None,
+            "ano": int(ano[idx]) if pd.notna(ano[idx]) else None,
+        }
+        
+        if clave in enrollments:
+            valores = {k: v for k, v in valores.items() if v is not None}
+            cambios[enrollments[clave]] = {"id": enrollments[clave], "actualizado_en": ahora, **valores}
+        else:
+            valores["status"] = valores["status"] or "completed"
+            nuevos[clave] = {"estudiante_id": clave[0], "course_id": clave[1], **valores}
+    
+    if nuevos:
+        session.execute(insert(Enrollment), list(nuevos.values()))
+    if cambios:
+        session.execute(update(Enrollment), list(cambios.values()))
+    
+    return {
+        "creados": len(nuevos),
+        "actualizados": len(cambios),
+        "errores": errores,
+        "documentos_no_encontrados": sorted(documento[documento.notna() & est_ids.isna()].unique()),
+        "materias_no_encontradas": sorted(materia_id[materia_id.notna() & course_ids.isna()].unique()),
+    }
+
+
 def run():
     st.title("📋 Gestión de Enrollments e Inscripciones")
     
@@ -320,7 +419,7 @@ def run():
                 st.info(f"{alert['tipo']}: {alert['mensaje']}")
     
     # Tabs para diferentes vistas
-    tab1, tab2, tab3, tab4 = st.tabs(["Plan vs Enrollments", "Agregar Enrollment", "Reconciliar", "Historial"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Plan vs Enrollments", "Agregar Enrollment", "Reconciliar", "Historial", "Importar Notas"])
     
     with tab1:
         st.subheader("Plan vigente vs Enrollments reales")
@@ -551,4 +650,58 @@ def run():
                                 st.experimental_rerun()
         else:
             st.info("No hay enrollments para este estudiante")
-
+    
+    with tab5:
+        st.subheader("Importar notas de la cohorte")
+        st.info(
+            "Planilla con columnas Documento y MateriaID (obligatorias) y Status, Nota, "
+            "NotaNumerica, Semestre, Año. Los enrollments nuevos sin Status se crean como 'completed'."
+        )
+        
+        archivo_notas = st.file_uploader(
+            "Selecciona planilla de notas",
+            type=["xlsx", "xls", "csv"],
+            key="notas_upload"
+        )
+        
+        if archivo_notas and st.button("🚀 Importar notas", key="import_notas"):
+            try:
+                if archivo_notas.name.endswith('.csv'):
+                    df_notas = pd.read_csv(archivo_notas, dtype=str)
+                else:
+                    df_notas = pd.read_excel(archivo_notas, dtype=str)
+                
+                faltantes = {"Documento", "MateriaID"} - set(df_notas.columns)
+                if faltantes:
+                    st.error(f"⚠️ Columnas faltantes: {', '.join(sorted(faltantes))}")
+                else:
+                    with st.spinner("Importando notas..."):
+                        with get_session() as session:
+                            resultado = importar_notas(df_notas, session)
+                            session.commit()
+                    
+                    _append_changelog(
+                        f"Importación de notas: {resultado['creados']} enrollments creados, "
+                        f"{resultado['actualizados']} actualizados"
+                    )
+                    
+                    st.success("✅ Importación completada")
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("Creados", resultado["creados"])
+                    col2.metric("Actualizados", resultado["actualizados"])
+                    col3.metric("Errores", len(resultado["errores"]))
+                    
+                    if resultado["documentos_no_encontrados"]:
+                        st.warning(f"Documentos no encontrados: {', '.join(resultado['documentos_no_encontrados'][:20])}")
+                    if resultado["materias_no_encontradas"]:
+                        st.warning(f"MateriaID no encontradas: {', '.join(resultado['materias_no_encontradas'][:20])}")
+                    
+                    if resultado["errores"]:
+                        with st.expander("Ver errores"):
+                            for error in resultado["errores"][:20]:
+                                st.error(error, icon="❌")
+                            if len(resultado["errores"]) > 20:
+                                st.info(f"... y {len(resultado['errores']) - 20} errores más")
+            except Exception as e:
+                logger.error(f"Error importando notas: {e}")
+                st.error(f"❌ Error: {str(e)}")
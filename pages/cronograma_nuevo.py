@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from io import BytesIO
 from datetime import date
+from openpyxl import load_workbook
 from lib.db import get_session
 from lib.models import Course, CourseSource
 from lib.io_excel import import_schedule_excel, exportar_excel
@@ -9,6 +10,70 @@ from lib.utils import get_logger, format_date
 
 logger = get_logger(__name__)
 
+SHEET_NAME = "CronogramaConsolidado"
+REQUIRED_COLUMNS = {
+    "Programa", "Año", "Módulo", "Materia", "Horas",
+    "Profesor 1", "Profesor 2", "Profesor 3", "Inicio", "Final",
+    "Día", "Horario", "Formato", "Orientación", "Comentarios",
+    "TipoMateria", "SolapaFuente", "MateriaID", "MateriaKey"
+}
+
+
+def validar_cronograma_excel(archivo) -> dict:
+    """
+    Validar estructura del Excel antes de importar.
+    
+    Abre el libro en modo solo lectura y lee únicamente los nombres de
+    hojas y la fila de encabezados, sin recorrer las filas de datos.
+    
+    Returns:
+        {
+            "es_valido": bool,
+            "mensaje": str,
+            "faltantes": List[str],
+            "extra": List[str],
+            "total_filas": int
+        }
+    """
+    resultado = {
+        "es_valido": False,
+        "mensaje": "",
+        "faltantes": [],
+        "extra": [],
+        "total_filas": 0
+    }
+    
+    try:
+        wb = load_workbook(archivo, read_only=True, data_only=True)
+    except Exception as e:
+        resultado["mensaje"] = f"No se pudo abrir el archivo: {str(e)}"
+        return resultado
+    
+    try:
+        if SHEET_NAME not in wb.sheetnames:
+            resultado["mensaje"] = f"Hoja '{SHEET_NAME}' no encontrada"
+            return resultado
+        
+        ws = wb[SHEET_NAME]
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        columnas = {str(c).strip() for c in header if c is not None}
+        
+        resultado["faltantes"] = sorted(REQUIRED_COLUMNS - columnas)
+        resultado["extra"] = sorted(columnas - REQUIRED_COLUMNS)
+        # max_row sale de la dimensión declarada en la hoja (sin recorrer filas)
+        resultado["total_filas"] = max((ws.max_row or 1) - 1, 0)
+        
+        if resultado["faltantes"]:
+            resultado["mensaje"] = f"Columnas faltantes: {', '.join(resultado['faltantes'])}"
+        else:
+            resultado["es_valido"] = True
+            resultado["mensaje"] = "Excel válido"
+        
+        return resultado
+    finally:
+        wb.close()
+
+
 def run():
     st.set_page_config(page_title="Cronograma", layout="wide")
     st.title("📅 Gestión de Cronograma")
@@ -34,9 +99,19 @@ def run():
             import_button = st.button("🚀 Importar", use_container_width=True, key="import_btn")
         
         if import_button:
+            validacion = None
+            if uploaded_file is not None and uploaded_file.name.endswith(".xlsx"):
+                validacion = validar_cronograma_excel(uploaded_file)
+            
             if uploaded_file is None:
                 st.error("⚠️ Por favor selecciona un archivo Excel")
+            elif validacion is not None and not validacion["es_valido"]:
+                st.error(f"❌ {validacion['mensaje']}")
+                logger.warning(f"Cronograma rechazado antes de importar: {validacion['mensaje']}")
             else:
+                if validacion is not None and validacion["extra"]:
+                    st.info(f"Columnas no utilizadas: {', '.join(validacion['extra'])}")
+                
                 with st.spinner("Importando cronograma..."):
                     # Guardar archivo temporal
                     import tempfile
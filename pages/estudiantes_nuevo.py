@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date
 from io import BytesIO
+from sqlalchemy import insert, update
 from lib.db import get_session
 from lib.models import Estudiante, Meeting, Ruta
 from lib.utils import get_logger, format_date
@@ -10,6 +11,152 @@ import os
 
 logger = get_logger(__name__)
 
+# Filas por bloque al importar CSV (se confirma un commit por bloque)
+CSV_CHUNK_SIZE = 5000
+
+
+def _normalizar_columna(serie: pd.Series) -> pd.Series:
+    """Trim sobre la columna completa; NaN y vacíos quedan como None."""
+    serie = serie.astype("string").str.strip()
+    serie = serie.mask(serie == "")
+    return serie.astype(object).where(serie.notna(), None)
+
+
+def importar_estudiantes(df: pd.DataFrame, col_documento: str, col_nombre: str,
+                         col_email: str, col_telefono: str, session,
+                         actualizar_existentes: bool = False,
+                         existentes: dict = None, vistos: set = None) -> dict:
+    """
+    Importar estudiantes en bloque desde un DataFrame ya leído.
+    
+    Carga una sola vez los documentos existentes, normaliza las columnas
+    mapeadas de forma vectorizada e inserta los nuevos estudiantes en un
+    único INSERT por lotes. Con actualizar_existentes=True también
+    actualiza email y teléfono de los estudiantes que ya existen.
+    
+    existentes (documento -> id) permite reutilizar el índice entre bloques
+    de una misma importación; se actualiza con los estudiantes creados.
+    vistos guarda los documentos ya procesados en bloques anteriores: una
+    repetición en un bloque posterior cuenta como duplicado, igual que si
+    ambas filas estuvieran en el mismo bloque.
+    
+    Returns:
+        {"creados": int, "actualizados": int, "duplicados": int, "errores": List[str]}
+    """
+    datos = pd.DataFrame({
+        "documento": _normalizar_columna(df[col_documento]),
+        "nombre": _normalizar_columna(df[col_nombre]),
+        "email": _normalizar_columna(df[col_email]) if col_email else None,
+        "telefono": _normalizar_columna(df[col_telefono]) if col_telefono else None,
+    }, index=df.index)
+    
+    vacios = datos["documento"].isna() | datos["nombre"].isna()
+    errores = [f"Fila {idx+2}: Documento o nombre vacío" for idx in datos.index[vacios]]
+    datos = datos[~vacios]
+    
+    if existentes is None:
+        existentes = dict(session.query(Estudiante.documento, Estudiante.id).all())
+    ya_existe = datos["documento"].isin(existentes.keys())
+    repetido_en_archivo = datos["documento"].duplicated()
+    if vistos is not None:
+        repetido_en_archivo |= datos["documento"].isin(vistos)
+        vistos.update(datos["documento"])
+    
+    nuevos = datos[~ya_existe & ~repetido_en_archivo]
+    if not nuevos.empty:
+        insertados = session.execute(insert(Estudiante).returning(Estudiante.documento, Estudiante.id), [
+            {
+                "documento": r["documento"],
+                "nombre": r["nombre"],
+                "email": r["email"],
+                "telefono": r["telefono"],
+                "estado": "activo",
+            }
+            for r in nuevos.to_dict("records")
+        ])
+        existentes.update(insertados.tuples().all())
+    
+    actualizados = 0
+    if actualizar_existentes and (col_email or col_telefono):
+        ahora = datetime.utcnow()
+        cambios = []
+        for r in datos[ya_existe & ~repetido_en_archivo].to_dict("records"):
+            valores = {k: r[k] for k in ("email", "telefono") if r[k] is not None}
+            if valores:
+                cambios.append({"id": existentes[r["documento"]], "actualizado_en": ahora, **valores})
+        if cambios:
+            session.execute(update(Estudiante), cambios)
+        actualizados = len(cambios)
+    
+    duplicados = len(datos) - len(nuevos) - actualizados
+    
+    return {
+        "creados": len(nuevos),
+        "actualizados": actualizados,
+        "duplicados": duplicados,
+        "errores": errores,
+    }
+
+
+def importar_estudiantes_csv(archivo, col_documento: str, col_nombre: str,
+                             col_email: str, col_telefono: str, session,
+                             actualizar_existentes: bool = False,
+                             chunksize: int = CSV_CHUNK_SIZE, al_avanzar=None) -> dict:
+    """
+    Importar estudiantes desde un CSV leyéndolo por bloques.
+    
+    Cada bloque pasa por importar_estudiantes() y se confirma con su propio
+    commit; el índice de documentos se carga una sola vez y se comparte
+    entre bloques. Si un bloque falla se revierte solo ese bloque y la
+    importación se detiene, conservando los totales ya confirmados.
+    
+    al_avanzar(resultado) se llama después de cada bloque confirmado.
+    
+    Returns:
+        {
+            "creados": int, "actualizados": int, "duplicados": int,
+            "errores": List[str], "procesadas": int,
+            "fallo": str | None   # error que detuvo la importación
+        }
+    """
+    resultado = {"creados": 0, "actualizados": 0, "duplicados": 0, "errores": [], "procesadas": 0, "fallo": None}
+    existentes = dict(session.query(Estudiante.documento, Estudiante.id).all())
+    vistos = set()
+    
+    try:
+        bloques = pd.read_csv(
+            archivo,
+            dtype=str,
+            usecols=[c for c in [col_documento, col_nombre, col_email, col_telefono] if c],
+            chunksize=chunksize
+        )
+        for bloque in bloques:
+            parcial = importar_estudiantes(
+                bloque, col_documento, col_nombre, col_email, col_telefono,
+                session, actualizar_existentes=actualizar_existentes,
+                existentes=existentes, vistos=vistos
+            )
+            session.commit()
+            
+            resultado["procesadas"] += len(bloque)
+            for k in ("creados", "actualizados", "duplicados"):
+                resultado[k] += parcial[k]
+            resultado["errores"].extend(parcial["errores"])
+            
+            if al_avanzar:
+                al_avanzar(resultado)
+    except Exception as e:
+        session.rollback()
+        resultado["fallo"] = str(e)
+        logger.error(
+            f"Importación de estudiantes interrumpida en la fila {resultado['procesadas'] + 2}: {str(e)} "
+            f"(ya confirmados: {resultado['creados']} creados, "
+            f"{resultado['actualizados']} actualizados, {resultado['duplicados']} duplicados)"
+        )
+    
+    return resultado
+
+
 def run():
     st.set_page_config(page_title="Estudiantes", layout="wide")
     st.title("👥 Gestión de Estudiantes")
@@ -215,13 +362,14 @@ def run():
         
         if uploaded_file:
             try:
-                # Leer archivo
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
+                # Leer archivo (CSV: solo encabezado y vista previa, se importa por bloques)
+                es_csv = uploaded_file.name.endswith('.csv')
+                if es_csv:
+                    df = pd.read_csv(uploaded_file, nrows=5, dtype=str)
+                    st.success(f"✓ Archivo cargado: {len(df.columns)} columnas (se importará en bloques de {CSV_CHUNK_SIZE} filas)")
                 else:
-                    df = pd.read_excel(uploaded_file)
-                
-                st.success(f"✓ Archivo cargado: {len(df)} filas")
+                    df = pd.read_excel(uploaded_file, dtype=str)
+                    st.success(f"✓ Archivo cargado: {len(df)} filas")
                 
                 # Mostrar columnas disponibles
                 st.subheader("Mapeo de Columnas")
@@ -263,53 +411,56 @@ def run():
                 if preview_cols:
                     st.dataframe(df[preview_cols].head(5), use_container_width=True, hide_index=True)
                 
+                actualizar_existentes = st.checkbox(
+                    "Actualizar email y teléfono de estudiantes existentes",
+                    key="import_actualizar"
+                )
+                
                 # Importar
                 if st.button("🚀 Importar Estudiantes", use_container_width=True):
                     if not col_documento or not col_nombre:
                         st.error("⚠️ Documento y Nombre son obligatorios")
                     else:
                         with st.spinner("Importando estudiantes..."):
-                            with get_session() as session:
-                                creados = 0
-                                duplicados = 0
-                                errores = []
-                                
-                                for idx, row in df.iterrows():
-                                    try:
-                                        documento = str(row[col_documento]).strip()
-                                        nombre = str(row[col_nombre]).strip()
-                                        email = str(row[col_email]).strip() if col_email else None
-                                        telefono = str(row[col_telefono]).strip() if col_telefono else None
-                                        
-                                        if not documento or not nombre:
-                                            errores.append(f"Fila {idx+2}: Documento o nombre vacío")
-                                            continue
-                                        
-                                        existe = session.query(Estudiante).filter_by(documento=documento).first()
-                                        
-                                        if existe:
-                                            duplicados += 1
-                                        else:
-                                            nuevo = Estudiante(
-                                                documento=documento,
-                                                nombre=nombre,
-                                                email=email if email and email != "None" else None,
-                                                telefono=telefono if telefono and telefono != "None" else None,
-                                                estado="activo"
-                                            )
-                                            session.add(nuevo)
-                                            creados += 1
-                                    
-                                    except Exception as e:
-                                        errores.append(f"Fila {idx+2}: {str(e)}")
-                                
-                                session.commit()
+                            if es_csv:
+                                progreso = st.empty()
+                                uploaded_file.seek(0)
+                                with get_session() as session:
+                                    resultado = importar_estudiantes_csv(
+                                        uploaded_file, col_documento, col_nombre, col_email, col_telefono,
+                                        session, actualizar_existentes=actualizar_existentes,
+                                        al_avanzar=lambda r: progreso.info(
+                                            f"Procesadas {r['procesadas']} filas — "
+                                            f"{r['creados']} creados, {r['duplicados']} duplicados, "
+                                            f"{len(r['errores'])} errores"
+                                        )
+                                    )
+                            else:
+                                with get_session() as session:
+                                    resultado = importar_estudiantes(
+                                        df, col_documento, col_nombre, col_email, col_telefono,
+                                        session, actualizar_existentes=actualizar_existentes
+                                    )
+                                    session.commit()
                         
-                        st.success(f"✅ Importación completada")
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Creados", creados)
-                        col2.metric("Duplicados", duplicados)
-                        col3.metric("Errores", len(errores))
+                        errores = resultado["errores"]
+                        if resultado.get("fallo"):
+                            st.error(
+                                f"❌ Importación interrumpida en el bloque que empieza en la fila {resultado['procesadas'] + 2}: "
+                                f"{resultado['fallo']}. Las filas anteriores ya quedaron guardadas."
+                            )
+                        else:
+                            logger.info(
+                                f"Importación de estudiantes: {resultado['creados']} creados, "
+                                f"{resultado['actualizados']} actualizados, {resultado['duplicados']} duplicados, "
+                                f"{len(errores)} errores"
+                            )
+                            st.success(f"✅ Importación completada")
+                        col1, col2, col3, col4 = st.columns(4)
+                        col1.metric("Creados", resultado["creados"])
+                        col2.metric("Actualizados", resultado["actualizados"])
+                        col3.metric("Duplicados", resultado["duplicados"])
+                        col4.metric("Errores", len(errores))
                         
                         if errores:
                             with st.expander("Ver errores"):
@@ -0,0 +1,188 @@
+import importlib
+import pandas as pd
+from lib.db import init_db, get_session
+from lib.models import Estudiante
+
+
+estudiantes_page = importlib.import_module("pages.estudiantes_nuevo")
+
+
+def setup_function():
+    init_db()
+    # limpiar tablas relevantes
+    from sqlalchemy import text
+    with get_session() as session:
+        session.execute(text("DELETE FROM student_plan_items"))
+        session.execute(text("DELETE FROM plan_versions"))
+        session.execute(text("DELETE FROM enrollments"))
+        session.execute(text("DELETE FROM courses"))
+        session.execute(text("DELETE FROM estudiantes"))
+        session.commit()
+
+
+def _documentos(session):
+    return {e.documento: (e.email, e.telefono) for e in session.query(Estudiante).all()}
+
+
+def test_importar_estudiantes_crea_y_reindexa():
+    df = pd.DataFrame({
+        "Doc": ["100", "200", "100", "", "300"],
+        "Nombre": ["Ana", "Beto", "Ana bis", "Sin doc", "Caro"],
+        "Mail": ["ana@x.com", None, "otra@x.com", None, " caro@x.com "],
+    })
+
+    with get_session() as session:
+        existentes = dict(session.query(Estudiante.documento, Estudiante.id).all())
+        resultado = estudiantes_page.importar_estudiantes(
+            df, "Doc", "Nombre", "Mail", "", session, existentes=existentes
+        )
+        session.commit()
+
+        assert resultado["creados"] == 3
+        assert resultado["duplicados"] == 1
+        assert resultado["errores"] == ["Fila 5: Documento o nombre vacío"]
+        # El índice compartido recibe los ids de los estudiantes creados
+        ids = dict(session.query(Estudiante.documento, Estudiante.id).all())
+        assert existentes == ids
+        assert _documentos(session)["300"] == ("caro@x.com", None)
+
+
+def test_importar_estudiantes_actualiza_existentes():
+    with get_session() as session:
+        session.add(Estudiante(documento="100", nombre="Ana", email="vieja@x.com", estado="activo"))
+        session.commit()
+
+    df = pd.DataFrame({"Doc": ["100", "400"], "Nombre": ["Ana", "Dani"], "Tel": ["555", None]})
+
+    with get_session() as session:
+        resultado = estudiantes_page.importar_estudiantes(
+            df, "Doc", "Nombre", "", "Tel", session, actualizar_existentes=True
+        )
+        session.commit()
+
+        assert resultado["creados"] == 1
+        assert resultado["actualizados"] == 1
+        assert resultado["duplicados"] == 0
+        assert _documentos(session)["100"] == ("vieja@x.com", "555")
+
+
+def test_importar_estudiantes_csv_por_bloques():
+    from io import StringIO
+
+    csv = StringIO(
+        "Doc,Nombre,Mail\n"
+        "100,Ana,ana@x.com\n"
+        "200,Beto,\n"
+        "300,Caro,caro@x.com\n"
+        "100,Ana repetida,otra@x.com\n"
+        ",Sin doc,\n"
+    )
+
+    with get_session() as session:
+        resultado = estudiantes_page.importar_estudiantes_csv(
+            csv, "Doc", "Nombre", "Mail", "", session,
+            actualizar_existentes=True, chunksize=2
+        )
+
+        assert resultado["fallo"] is None
+        assert resultado["procesadas"] == 5
+        assert resultado["creados"] == 3
+        # La repetición en otro bloque es un duplicado, no una actualización
+        assert resultado["actualizados"] == 0
+        assert resultado["duplicados"] == 1
+        assert resultado["errores"] == ["Fila 6: Documento o nombre vacío"]
+        assert _documentos(session)["100"] == ("ana@x.com", None)
+
+
+def test_importar_estudiantes_csv_solo_encabezado():
+    from io import StringIO
+
+    with get_session() as session:
+        resultado = estudiantes_page.importar_estudiantes_csv(
+            StringIO("Doc,Nombre\n"), "Doc", "Nombre", "", "", session, chunksize=2
+        )
+
+    assert resultado["fallo"] is None
+    assert resultado["procesadas"] == 0
+    assert (resultado["creados"], resultado["duplicados"], resultado["errores"]) == (0, 0, [])
+
+
+def _crear_estudiante_y_curso(session, documento="100", materia_id="M1", **curso):
+    from lib.models import Course
+    estudiante = Estudiante(documento=documento, nombre=f"Est {documento}", estado="activo")
+    course = Course(materia_id=materia_id, materia_key=materia_id, nombre=f"Materia {materia_id}", **curso)
+    session.add_all([estudiante, course])
+    session.flush()
+    return estudiante.id, course.id
+
+
+def test_importar_notas_upsert_y_errores_por_fila():
+    from lib.models import Enrollment
+    inscripciones_page = importlib.import_module("pages.04_Inscripciones")
+
+    with get_session() as session:
+        est_id, course_id = _crear_estudiante_y_curso(session)
+        existente = Enrollment(estudiante_id=est_id, course_id=course_id, status="in_progress")
+        session.add(existente)
+        session.commit()
+
+    df = pd.DataFrame({
+        "Documento": ["100", "100", "999", "100", "100"],
+        "MateriaID": ["M1", "M1", "M1", "NOPE", "M1"],
+        "Nota": ["B", "A", "C", "A", "A"],
+        "NotaNumerica": ["3.5", "4.5", "4", "4", "4"],
+        "Semestre": ["1", "2", "1", "1", "9"],
+        "Año": ["2024", "2024", "2024", "2024", "x"],
+    }, dtype=str)
+
+    with get_session() as session:
+        resultado = inscripciones_page.importar_notas(df, session)
+        session.commit()
+
+        # Dos filas para el mismo enrollment cuentan una sola vez; gana la última
+        assert resultado["creados"] == 0
+        assert resultado["actualizados"] == 1
+        en = session.query(Enrollment).filter_by(estudiante_id=est_id).one()
+        assert (en.status, en.nota, en.nota_numerica, en.semestre) == ("in_progress", "A", 4.5, 2)
+
+        assert resultado["errores"] == [
+            "Fila 4: Documento no encontrado",
+            "Fila 5: MateriaID no encontrada",
+            "Fila 6: Semestre inválido",
+        ]
+        assert resultado["documentos_no_encontrados"] == ["999"]
+        assert resultado["materias_no_encontradas"] == ["NOPE"]
+
+
+def test_importar_planes_crea_versiones_e_items():
+    from datetime import date
+    from lib.models import Course, PlanVersion, StudentPlanItem
+    rutas_page = importlib.import_module("pages.03_Rutas")
+
+    with get_session() as session:
+        est_id, course_id = _crear_estudiante_y_curso(session, ano=2025, estado="activo")
+        session.add(Course(materia_id="VIEJA", materia_key="VIEJA", nombre="Vieja", estado="inactivo"))
+        session.commit()
+
+    df = pd.DataFrame({
+        "Documento": ["100", "100", "100", "100"],
+        "MateriaID": ["VIEJA", "M1", "M1", "M1"],
+        "Año": ["", "", "", ""],
+        "Prioridad": ["1", "1.7", "2", ""],
+        "EsBackup": ["", "", "sí", ""],
+    }, dtype=str)
+
+    with get_session() as session:
+        resultado = rutas_page.importar_planes(df, session)
+        session.commit()
+
+        assert resultado["errores"] == ["Fila 2: MateriaID inactiva", "Fila 3: Prioridad inválida"]
+        assert resultado["versiones_creadas"] == 1
+        assert resultado["items_creados"] == 1
+        assert resultado["ya_en_plan"] == 1
+
+        version = session.query(PlanVersion).filter_by(estudiante_id=est_id).one()
+        assert version.vigente_hasta is None and version.vigente_desde == date.today()
+        item = session.query(StudentPlanItem).filter_by(plan_version_id=version.id).one()
+        # Sin Año en la planilla se usa el del curso
+        assert (item.course_id, item.ano, item.prioridad, item.es_backup) == (course_id, 2025, 2, True)
@@ -0,0 +1,45 @@
+import importlib
+from io import BytesIO
+import pandas as pd
+
+
+cronograma_page = importlib.import_module("pages.cronograma_nuevo")
+
+
+def _excel(df, sheet_name="CronogramaConsolidado"):
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name=sheet_name)
+    buffer.seek(0)
+    return buffer
+
+
+def test_validar_cronograma_excel_valido():
+    columnas = sorted(cronograma_page.REQUIRED_COLUMNS) + ["Notas internas"]
+    df = pd.DataFrame([["x"] * len(columnas)] * 3, columns=columnas)
+
+    resultado = cronograma_page.validar_cronograma_excel(_excel(df))
+
+    assert resultado["es_valido"] is True
+    assert resultado["faltantes"] == []
+    assert resultado["extra"] == ["Notas internas"]
+    assert resultado["total_filas"] == 3
+
+
+def test_validar_cronograma_excel_columnas_faltantes():
+    df = pd.DataFrame({"Programa": ["MBA"], "MateriaID": ["M1"]})
+
+    resultado = cronograma_page.validar_cronograma_excel(_excel(df))
+
+    assert resultado["es_valido"] is False
+    assert "Materia" in resultado["faltantes"]
+    assert resultado["mensaje"].startswith("Columnas faltantes")
+
+
+def test_validar_cronograma_excel_hoja_inexistente():
+    df = pd.DataFrame({"Programa": ["MBA"]})
+
+    resultado = cronograma_page.validar_cronograma_excel(_excel(df, sheet_name="Otra"))
+
+    assert resultado["es_valido"] is False
+    assert resultado["mensaje"] == "Hoja 'CronogramaConsolidado' no encontrada"